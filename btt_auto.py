@@ -6,41 +6,84 @@ import time
 import threading
 import subprocess
 import sqlite3
+import collections
+import atexit
+import itertools
+import re
+import queue
+import shlex
+import shutil
+import signal
 from datetime import datetime, timedelta
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 from rich.live import Live
 from rich.layout import Layout
 from rich import box
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import urllib.parse
 import traceback
 # Consolidated functions from getsql.py
 
 # Configuration file
 CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'btt_config.json')
-console = Console()
+# Shared console; highlighting off so plain prints skip Rich's
+# auto-highlighter pass (hand-authored markup still renders)
+console = Console(highlight=False)
 
 # Consolidated functions from getsql.py
 DB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'db')
 LOCAL_DB_PATH = os.path.join(DB_DIR, 'sql.db')
+# Create once at import rather than exists-checking on every pull
+os.makedirs(DB_DIR, exist_ok=True)
+
+def _pull_ok(path):
+    """True if an adb pull produced a non-empty file at path"""
+    try:
+        return os.stat(path).st_size > 0
+    except FileNotFoundError:
+        return False
 DEVICE_DB_PATH = '/data/data/com.bca.bcatrack/cache/cache/data/sql.db'
 
 # --- Robust Logger ---
+# Timestamp string cached per second; recomputing isoformat() for every log
+# line is measurable under bursty webhook logging
+_TS_CACHE = [0, '']
+
 class Logger:
     def __init__(self, log_path):
         self.log_path = log_path
         os.makedirs(os.path.dirname(log_path), exist_ok=True)
-    def log(self, msg, level='INFO'):
-        line = f"[{datetime.now().isoformat()}] [{level}] {msg}"
+        # One persistent line-buffered handle instead of an open/close
+        # syscall pair per log line
         try:
-            with open(self.log_path, 'a') as f:
-                f.write(line + '\n')
+            self._fh = open(log_path, 'a', buffering=1)
         except Exception:
-            pass
+            self._fh = None
+        atexit.register(self.close)
+    def log(self, msg, level='INFO'):
+        t = int(time.time())
+        cache = _TS_CACHE
+        if cache[0] != t:
+            cache[0] = t
+            cache[1] = datetime.fromtimestamp(t).isoformat(timespec='seconds')
+        line = f"[{cache[1]}] [{level}] {msg}"
+        if self._fh is not None:
+            try:
+                self._fh.write(line + '\n')
+            except Exception:
+                pass
         print(line)
+    def close(self):
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except Exception:
+                pass
+            self._fh = None
     def tail(self, n=200):
         try:
             with open(self.log_path, 'r') as f:
@@ -60,17 +103,15 @@ def startup_checks():
     logger.log('Startup checks...')
     # Python version
     logger.log(f'Python version: {sys.version}')
-    # Permissions
+    # Permissions - os.access is a stat-level check, no write probe needed
     for path in ['.', 'db', 'logs', LOG_PATH]:
-        try:
-            testfile = os.path.join(path, 'test.tmp') if os.path.isdir(path) else path
-            with open(testfile, 'a') as f:
-                f.write('test')
-            if os.path.isdir(path):
-                os.remove(testfile)
+        if not os.path.exists(path):
+            logger.log(f'Write check skipped (missing): {path}')
+            continue
+        if os.access(path, os.W_OK):
             logger.log(f'Write check passed: {path}')
-        except Exception as e:
-            logger.log(f'Write check FAILED: {path} ({e})', 'ERROR')
+        else:
+            logger.log(f'Write check FAILED: {path} (not writable)', 'ERROR')
     # DB check
     db_path = os.path.join('db', 'sql.db')
     if os.path.exists(db_path):
@@ -86,19 +127,55 @@ def startup_checks():
     else:
         logger.log('DB file missing: db/sql.db', 'ERROR')
 
-startup_checks()
-
 # Webhook server configuration
 WEBHOOK_PORT = 5680
 WEBHOOK_HOST = '0.0.0.0'  # Changed from 'localhost' to '0.0.0.0' for Docker access
 
 class WebhookHandler(BaseHTTPRequestHandler):
     """HTTP request handler for webhook endpoints"""
-    
+
+    # HTTP/1.1 keeps the connection open between polls from the web UI,
+    # avoiding a TCP handshake per request; requires Content-Length on
+    # every response (handled by the _send_* helpers below)
+    protocol_version = 'HTTP/1.1'
+
+    # Path -> handler method name; O(1) dispatch instead of an if/elif chain
+    _GET_ROUTES = {
+        '/': 'serve_web_ui',
+        '/webhook/ui': 'serve_web_ui',
+        '/webhook/dwjjob': 'serve_dwjjob',
+        '/webhook/dwvveh': 'serve_dwvveh',
+        '/healthz': 'serve_health',
+        '/status': 'serve_status',
+        '/webhook/adb-ips': 'serve_adb_ips',
+        '/webhook/load-numbers': 'serve_load_numbers',
+        '/network-server.png': 'serve_icon',
+        '/webhook/logs': 'serve_logs',
+        '/webhook/ping': 'serve_ping',
+    }
+    _POST_ROUTES = {
+        '/webhook/control': 'handle_control',
+        '/webhook/adb-ips': 'handle_adb_ips',
+        '/webhook/test-connection': 'handle_test_connection',
+    }
+
     def __init__(self, *args, **kwargs):
         self.manager = kwargs.pop('manager', None)
         super().__init__(*args, **kwargs)
     
+    def _send_bytes(self, body, content_type, status=200):
+        """Send a complete response with Content-Length (required for keep-alive)"""
+        self.send_response(status)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, obj, status=200):
+        """Serialize obj as JSON and send it with proper headers"""
+        self._send_bytes(json.dumps(obj, indent=2).encode(), 'application/json', status)
+
     def log_message(self, format, *args):
         """Override to use our logging system"""
         message = format % args
@@ -108,41 +185,29 @@ class WebhookHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         logger.log(f"do_GET entry: {self.path}")
         try:
-            parsed_path = urllib.parse.urlparse(self.path)
-            path = parsed_path.path
-            query = urllib.parse.parse_qs(parsed_path.query)
+            # Fast path: most endpoints have no query string, so skip the
+            # urlparse/parse_qs machinery unless a '?' is present
+            q_idx = self.path.find('?')
+            if q_idx < 0:
+                path = self.path
+                query = {}
+            else:
+                path = self.path[:q_idx]
+                query = urllib.parse.parse_qs(self.path[q_idx + 1:])
             logger.log(f"GET {path}")
             
             # Log the incoming request
             if self.manager:
                 self.manager.log_webhook(f"GET request: {path}")
             
-            if path == '/':
-                self.serve_web_ui()
-            elif path == '/webhook/ui':
-                self.serve_web_ui()
-            elif path == '/webhook/dwjjob':
-                self.serve_dwjjob()
-            elif path == '/webhook/dwvveh':
-                self.serve_dwvveh()
-            elif path == '/healthz':
-                self.serve_health()
-            elif path == '/status':
-                self.serve_status()
-            elif path == '/webhook/adb-ips':
-                self.serve_adb_ips()
-            elif path == '/webhook/load-numbers':
-                self.serve_load_numbers()
-            elif path == '/webhook/load-details':
+            if path == '/webhook/load-details':
                 self.serve_load_details(query)
-            elif path == '/network-server.png':
-                self.serve_icon()
-            elif path == '/webhook/logs':
-                self.serve_logs()
-            elif path == '/webhook/ping':
-                self.serve_ping()
             else:
-                self.send_error(404, "Endpoint not found")
+                handler_name = self._GET_ROUTES.get(path)
+                if handler_name:
+                    getattr(self, handler_name)()
+                else:
+                    self.send_error(404, "Endpoint not found")
                 
         except Exception as e:
             logger.log(f"Webhook GET error: {e}\n{traceback.format_exc()}", 'ERROR')
@@ -155,8 +220,8 @@ class WebhookHandler(BaseHTTPRequestHandler):
     def do_POST(self):
         logger.log(f"do_POST entry: {self.path}")
         try:
-            parsed_path = urllib.parse.urlparse(self.path)
-            path = parsed_path.path
+            # POST endpoints never use the query string
+            path = self.path.split('?', 1)[0]
             
             # Log the incoming request
             if self.manager:
@@ -166,12 +231,9 @@ class WebhookHandler(BaseHTTPRequestHandler):
             content_length = int(self.headers.get('Content-Length', 0))
             post_data = self.rfile.read(content_length).decode('utf-8')
             
-            if path == '/webhook/control':
-                self.handle_control(post_data)
-            elif path == '/webhook/adb-ips':
-                self.handle_adb_ips(post_data)
-            elif path == '/webhook/test-connection':
-                self.handle_test_connection(post_data)
+            handler_name = self._POST_ROUTES.get(path)
+            if handler_name:
+                getattr(self, handler_name)(post_data)
             else:
                 self.send_error(404, "Endpoint not found")
                 
@@ -201,6 +263,11 @@ class WebhookHandler(BaseHTTPRequestHandler):
             elif action == 'run_extraction':
                 extraction_result = self.manager.run_getsql_webhook()
                 response = {'status': 'success', 'message': 'SQL extraction finished', 'extractionResult': extraction_result}
+            elif action == 'run_extraction_all':
+                self.manager.log_webhook("SQL extraction on all devices started via webhook")
+                results = self.manager.run_getsql_all()
+                response = {'status': 'success', 'message': 'SQL extraction finished on all devices',
+                            'extractionResults': results}
             elif action == 'update_status':
                 self.manager.update_last_stats()
                 response = {'status': 'success', 'message': 'Status updated'}
@@ -214,11 +281,7 @@ class WebhookHandler(BaseHTTPRequestHandler):
             else:
                 response = {'status': 'error', 'message': 'Invalid action'}
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response, indent=2).encode())
+            self._send_json(response)
             
         except json.JSONDecodeError:
             self.send_error(400, "Invalid JSON")
@@ -268,11 +331,7 @@ class WebhookHandler(BaseHTTPRequestHandler):
             else:
                 response = {'status': 'error', 'message': 'Invalid action'}
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response, indent=2).encode())
+            self._send_json(response)
             
         except json.JSONDecodeError:
             self.send_error(400, "Invalid JSON")
@@ -297,11 +356,7 @@ class WebhookHandler(BaseHTTPRequestHandler):
             else:
                 response = {'status': 'error', 'message': 'IP address required'}
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(response, indent=2).encode())
+            self._send_json(response)
             
         except json.JSONDecodeError:
             self.send_error(400, "Invalid JSON")
@@ -313,11 +368,7 @@ class WebhookHandler(BaseHTTPRequestHandler):
         """Serve DWJJOB data as JSON"""
         try:
             data = self.manager.get_dwjjob_data()
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(data, indent=2).encode())
+            self._send_json(data)
         except Exception as e:
             logger.log(f"Failed to serve DWJJOB data: {e}\n{traceback.format_exc()}", 'ERROR')
             self.send_error(500, f"Failed to serve DWJJOB data: {e}")
@@ -326,21 +377,14 @@ class WebhookHandler(BaseHTTPRequestHandler):
         """Serve DWVVEH data as JSON"""
         try:
             data = self.manager.get_dwvveh_data()
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(data, indent=2).encode())
+            self._send_json(data)
         except Exception as e:
             logger.log(f"Failed to serve DWVVEH data: {e}\n{traceback.format_exc()}", 'ERROR')
             self.send_error(500, f"Failed to serve DWVVEH data: {e}")
     
     def serve_health(self):
         """Serve health check endpoint"""
-        self.send_response(200)
-        self.send_header('Content-type', 'text/plain')
-        self.end_headers()
-        self.wfile.write(b'OK')
+        self._send_bytes(b'OK', 'text/plain')
     
     def serve_status(self):
         """Serve status information as JSON"""
@@ -354,21 +398,28 @@ class WebhookHandler(BaseHTTPRequestHandler):
             any_connected = False
             any_unauthorized = False
             adb_device_name = None
-            try:
-                adb_ips = self.manager.get_adb_ips()
+            def scan_devices():
+                # One cached `adb devices` snapshot covers every device;
+                # each lookup after that is a dict access
+                nonlocal any_connected, any_unauthorized, adb_device_name
                 for device in adb_ips:
                     ip = device.get('ip', device)
-                    name = device.get('name', ip)
-                    try:
-                        connected, _, unauthorized = self.manager.test_adb_connection(ip)
-                        if unauthorized:
-                            any_unauthorized = True
-                        if connected:
-                            any_connected = True
-                            adb_device_name = name
-                            break
-                    except Exception as e:
-                        self.manager.log_webhook(f"Error testing ADB connection for {ip}: {e}")
+                    connected, unauthorized = self.manager.adb_device_state(ip)
+                    if unauthorized:
+                        any_unauthorized = True
+                    if connected:
+                        any_connected = True
+                        adb_device_name = device.get('name', ip)
+                        return
+            try:
+                adb_ips = self.manager.get_adb_ips()
+                if adb_ips:
+                    scan_devices()
+                    # A dropped wifi-adb link usually just needs one adb
+                    # connect; try that (rate-limited) before the block below
+                    # concludes the device is gone and disables auto-update
+                    if not any_connected and self.manager.maybe_reconnect_adb():
+                        scan_devices()
             except Exception as e:
                 self.manager.log_webhook(f"Error getting ADB IPs: {e}")
             # If no ADB device is connected, force auto_enabled to False
@@ -382,28 +433,19 @@ class WebhookHandler(BaseHTTPRequestHandler):
             # Build status with safe attribute access
             # Show 'off' if device is connected but auto-update is off
             auto_status = 'enabled' if self.manager.config.get('auto_enabled', False) else ('off' if any_connected else 'disabled')
-            status = {
+            # Copy the pre-built template and patch in only the volatile fields
+            status = dict(self.manager.status_template)
+            status.update({
                 'autoEnabled': self.manager.config.get('auto_enabled', False),
                 'autoStatus': auto_status,
-                'intervalMinutes': self.manager.config.get('interval_minutes', 5),
                 'uptime': time.time() - getattr(self.manager, 'start_time', time.time()),
-                'lastLocations': self.manager.config.get('last_locations', 0),
-                'lastCars': self.manager.config.get('last_cars', 0),
-                'lastLoads': self.manager.config.get('last_loads', 0),
-                'lastProcessed': self.manager.config.get('last_sql_atime', None),
-                'webhookServer': 'Running',
                 'timestamp': datetime.now().isoformat(),
                 'adbConnected': any_connected,
                 'adbUnauthorized': any_unauthorized,
                 'adbAttentionNeeded': (not any_connected and any_unauthorized),
-                'preferredDevice': self.manager.config.get('preferred_device', None),
                 'adbDeviceName': adb_device_name
-            }
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(status, indent=2).encode())
+            })
+            self._send_json(status)
         except Exception as e:
             logger.log(f"Status error: {e}\n{traceback.format_exc()}", 'ERROR')
             error_msg = f"Status error: {e}"
@@ -418,13 +460,9 @@ class WebhookHandler(BaseHTTPRequestHandler):
             result = []
             for device in adb_ips:
                 ip = device.get('ip', device)
-                connected, _, unauthorized = self.manager.test_adb_connection(ip)
+                connected, unauthorized = self.manager.adb_device_state(ip)
                 result.append({'ip': ip, 'name': device.get('name', ip), 'connected': connected, 'unauthorized': unauthorized})
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(result, indent=2).encode())
+            self._send_json(result)
         except Exception as e:
             logger.log(f"Failed to serve ADB IPs: {e}\n{traceback.format_exc()}", 'ERROR')
             self.send_error(500, f"Failed to serve ADB IPs: {e}")
@@ -433,11 +471,7 @@ class WebhookHandler(BaseHTTPRequestHandler):
         """Serve load numbers as JSON"""
         try:
             data = self.manager.get_load_numbers()
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(data, indent=2).encode())
+            self._send_json(data)
         except Exception as e:
             logger.log(f"Failed to serve load numbers: {e}\n{traceback.format_exc()}", 'ERROR')
             self.send_error(500, f"Failed to serve load numbers: {e}")
@@ -452,29 +486,40 @@ class WebhookHandler(BaseHTTPRequestHandler):
                 self.send_error(400, "Missing loadNumber parameter")
                 return
             data = self.manager.get_load_details(load_number)
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps(data, indent=2).encode())
+            self._send_json(data)
         except Exception as e:
             logger.log(f"Failed to serve load details: {e}\n{traceback.format_exc()}", 'ERROR')
             self.send_error(500, f"Failed to serve load details: {e}")
 
+    def _send_file(self, file_path, content_type, cache_control=None):
+        """Send a static file, using os.sendfile for a zero-copy path when available"""
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self.send_response(200)
+            self.send_header('Content-type', content_type)
+            self.send_header('Content-Length', str(size))
+            self.send_header('Access-Control-Allow-Origin', '*')
+            if cache_control:
+                self.send_header('Cache-Control', cache_control)
+            self.end_headers()
+            try:
+                self.wfile.flush()
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(self.wfile.fileno(), f.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            except (AttributeError, OSError):
+                # Non-Linux or non-socket wfile: fall back to a buffered copy
+                self.wfile.write(f.read())
+
     def serve_icon(self):
         """Serve the application icon"""
         try:
             icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'network-server.png')
             if os.path.exists(icon_path):
-                with open(icon_path, 'rb') as f:
-                    icon_content = f.read()
-                
-                self.send_response(200)
-                self.send_header('Content-type', 'image/png')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.send_header('Cache-Control', 'public, max-age=86400')
-                self.end_headers()
-                self.wfile.write(icon_content)
+                self._send_file(icon_path, 'image/png', cache_control='public, max-age=86400')
             else:
                 self.send_error(404, "Icon file not found")
         except Exception as e:
@@ -487,14 +532,7 @@ class WebhookHandler(BaseHTTPRequestHandler):
             # Read the web UI HTML file
             html_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'web_ui.html')
             if os.path.exists(html_path):
-                with open(html_path, 'r', encoding='utf-8') as f:
-                    html_content = f.read()
-                
-                self.send_response(200)
-                self.send_header('Content-type', 'text/html')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(html_content.encode('utf-8'))
+                self._send_file(html_path, 'text/html')
             else:
                 # Fallback HTML if file doesn't exist
                 fallback_html = """
@@ -508,11 +546,7 @@ class WebhookHandler(BaseHTTPRequestHandler):
                 </body>
                 </html>
                 """
-                self.send_response(200)
-                self.send_header('Content-type', 'text/html')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(fallback_html.encode('utf-8'))
+                self._send_bytes(fallback_html.encode('utf-8'), 'text/html')
                 
         except Exception as e:
             logger.log(f"Failed to serve web UI: {e}\n{traceback.format_exc()}", 'ERROR')
@@ -521,11 +555,7 @@ class WebhookHandler(BaseHTTPRequestHandler):
     def serve_logs(self):
         try:
             logs = logger.tail(200)
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(logs.encode())
+            self._send_bytes(logs.encode(), 'text/plain')
         except Exception as e:
             logger.log(f"Failed to serve logs: {e}\n{traceback.format_exc()}", 'ERROR')
             self.send_error(500, f"Failed to serve logs: {e}")
@@ -533,32 +563,59 @@ class WebhookHandler(BaseHTTPRequestHandler):
     def serve_ping(self):
         try:
             logger.log("serve_ping called")
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(b'pong')
+            self._send_bytes(b'pong', 'text/plain')
         except Exception as e:
             logger.log(f"Failed to serve ping: {e}\n{traceback.format_exc()}", 'ERROR')
-            self.send_response(500)
-            self.send_header('Content-type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(b'Internal server error (serve_ping)')
+            self._send_bytes(b'Internal server error (serve_ping)', 'text/plain', status=500)
+
+# Letters assigned to collection/delivery address codes (A-Z then a-z);
+# zip() against this caps the assignment at 52 codes explicitly
+_LETTERS = tuple(map(chr, list(range(65, 91)) + list(range(97, 123))))
+
+def _dict_row(cursor, row):
+    """sqlite3 row factory that materializes dicts during fetch, coercing None to ''"""
+    return {d[0]: ('' if value is None else value) for d, value in zip(cursor.description, row)}
+
+def _load_number_key(entry):
+    """Sort key that orders numeric load numbers numerically ('2' before '10')"""
+    load = str(entry['loadNumber'])
+    if load.isdigit():
+        return (0, int(load), '')
+    return (1, 0, load)
 
 class BTTAutoManager:
     def __init__(self):
         logger.log('BTTAutoManager.__init__ START')
         # Set start_time first before any other operations
         self.start_time = time.time()
+        self._config_lock = threading.Lock()
+        self._config_dirty = threading.Event()
         self.config = self.load_config()
+        self._build_adb_index()
+        self._refresh_status_template()
+        # Background writer coalesces bursts of save_config() calls into one
+        # atomic write at most every 500ms
+        self._config_writer_thread = threading.Thread(target=self._config_writer_loop, daemon=True)
+        self._config_writer_thread.start()
+        atexit.register(self._flush_config)
         self.running = False
         self.last_run = None
         self.last_stats = None
         self.auto_thread = None
         self.webhook_server = None
         self.webhook_thread = None
-        self.webhook_logs = []
+        self.webhook_logs = collections.deque(maxlen=self.config.get('webhook_log_capacity', 500))
         self.next_update_time = None
+        self._adb_snapshot = None
+        self._adb_snapshot_ts = 0.0
+        self._adb_snapshot_lock = threading.Lock()
+        self._last_reconnect_ts = 0.0
+        self._adb_connected_ip = None
+        self._adb_last_verified_ts = 0.0
+        self._status_cache = None
+        self._status_cache_ts = 0.0
+        # Static menu table built once; show_menu reprints it every cycle
+        self._main_menu_table = self._build_menu_table()
         # Always sync auto_enabled with config
         self.auto_enabled = self.config.get('auto_enabled', False)
         self.interval_minutes = self.config.get('interval_minutes', 5)
@@ -572,6 +629,17 @@ class BTTAutoManager:
             'lastProcessed': None,
             'processingStatus': 'idle'
         }
+        # Per-load indices rebuilt on every extraction; load-details lookups
+        # then touch only the rows for that load instead of the whole table
+        self._dwjjob_by_load = {}
+        self._dwvveh_by_load = {}
+        # Webhook payloads materialized once per extraction; the underlying
+        # data only changes when extract_sqlite_data runs
+        self._load_numbers_cache = None
+        self._load_details_cache = {}
+        # Epoch form of extracted_data['lastProcessed'], so status requests
+        # do plain arithmetic instead of re-parsing the ISO timestamp
+        self._last_processed_epoch = None
         logger.log(f'BTTAutoManager.__init__ loaded config: auto_enabled={self.auto_enabled}, interval_minutes={self.interval_minutes}')
         logger.log('BTTAutoManager.__init__ END')
     
@@ -610,90 +678,127 @@ class BTTAutoManager:
             logger.log('Created default config')
             return default_config
     
+    def _refresh_status_template(self):
+        """Pre-build the slow-changing part of the /status payload.
+
+        Only changes when the config changes, so /status requests can copy
+        this dict and patch in the handful of volatile fields.
+        """
+        self.status_template = {
+            'intervalMinutes': self.config.get('interval_minutes', 5),
+            'lastLocations': self.config.get('last_locations', 0),
+            'lastCars': self.config.get('last_cars', 0),
+            'lastLoads': self.config.get('last_loads', 0),
+            'lastProcessed': self.config.get('last_sql_atime', None),
+            'webhookServer': 'Running',
+            'preferredDevice': self.config.get('preferred_device', None),
+        }
+
     def save_config(self, config=None):
-        """Save configuration to JSON file"""
-        if config is None:
-            config = self.config
+        """Mark the configuration dirty; the writer thread persists it"""
+        if config is not None:
+            # Explicit config (first-run default creation) is written
+            # immediately; self.config may not be assigned yet at that point
+            self._write_config(config)
+            return
+        self._refresh_status_template()
+        self._config_dirty.set()
+
+    def _write_config(self, config):
+        """Atomically write config to disk (tmp file + rename)"""
         try:
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(config, f, indent=2)
+            with self._config_lock:
+                tmp_path = CONFIG_FILE + '.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(config, f, indent=2)
+                os.replace(tmp_path, CONFIG_FILE)
         except Exception as e:
             console.print(f"[red]Error saving config: {e}[/red]")
+
+    def _config_writer_loop(self):
+        """Daemon loop that sleeps until the config is dirty, then flushes.
+
+        The short debounce window after waking coalesces bursts of toggles
+        into a single disk write.
+        """
+        while True:
+            self._config_dirty.wait()
+            time.sleep(0.25)
+            self._config_dirty.clear()
+            self._write_config(self.config)
+
+    def _flush_config(self):
+        """Write the config out now if there are unsaved changes"""
+        if not self._config_dirty.is_set():
+            return
+        self._config_dirty.clear()
+        self._write_config(self.config)
     
+    def _build_adb_index(self):
+        """Normalize adb_ips to dicts and index them by IP for O(1) lookups"""
+        normalized = []
+        index = {}
+        for device in self.config.get('adb_ips', []):
+            if not isinstance(device, dict):
+                # Old format (plain string) - convert to new format
+                device = {'ip': device, 'name': f'Device {len(normalized) + 1}'}
+            normalized.append(device)
+            index[device['ip']] = device
+        self.config['adb_ips'] = normalized
+        self._adb_index = index
+
     def add_adb_ip(self, ip, name=None):
         """Add ADB IP address to the list"""
-        if ip not in [device.get('ip', device) for device in self.config.get('adb_ips', [])]:
-            if 'adb_ips' not in self.config:
-                self.config['adb_ips'] = []
-            # Store as object with ip and name
-            device_name = name if name else f'Device {len(self.config["adb_ips"]) + 1}'
-            self.config['adb_ips'].append({'ip': ip, 'name': device_name})
-            self.save_config()
-            self.log_webhook(f"Added ADB IP: {ip} ({device_name})")
-            console.print(f"[green]Added ADB IP: {ip} ({device_name})[/green]")
-    
+        if ip in self._adb_index:
+            return
+        # Store as object with ip and name
+        device_name = name if name else f'Device {len(self.config["adb_ips"]) + 1}'
+        device = {'ip': ip, 'name': device_name}
+        self.config['adb_ips'].append(device)
+        self._adb_index[ip] = device
+        self.save_config()
+        invalidate_device_cache()
+        self.log_webhook(f"Added ADB IP: {ip} ({device_name})")
+        console.print(f"[green]Added ADB IP: {ip} ({device_name})[/green]")
+
     def remove_adb_ip(self, ip):
         """Remove ADB IP address from the list"""
-        adb_ips = self.config.get('adb_ips', [])
-        for i, device in enumerate(adb_ips):
-            device_ip = device.get('ip', device) if isinstance(device, dict) else device
-            if device_ip == ip:
-                self.config['adb_ips'].pop(i)
-                self.save_config()
-                self.log_webhook(f"Removed ADB IP: {ip}")
-                console.print(f"[yellow]Removed ADB IP: {ip}[/yellow]")
-                break
-    
+        device = self._adb_index.pop(ip, None)
+        if device is None:
+            return
+        self.config['adb_ips'].remove(device)
+        self.save_config()
+        invalidate_device_cache()
+        self.log_webhook(f"Removed ADB IP: {ip}")
+        console.print(f"[yellow]Removed ADB IP: {ip}[/yellow]")
+
     def rename_adb_device(self, ip, name):
         """Rename an ADB device"""
-        adb_ips = self.config.get('adb_ips', [])
-        for device in adb_ips:
-            device_ip = device.get('ip', device) if isinstance(device, dict) else device
-            if device_ip == ip:
-                if isinstance(device, dict):
-                    device['name'] = name
-                else:
-                    # Convert string to dict
-                    idx = adb_ips.index(device)
-                    adb_ips[idx] = {'ip': device, 'name': name}
-                self.save_config()
-                self.log_webhook(f"Renamed ADB device {ip} to: {name}")
-                console.print(f"[green]Renamed ADB device {ip} to: {name}[/green]")
-                break
-    
+        device = self._adb_index.get(ip)
+        if device is None:
+            return
+        device['name'] = name
+        self.save_config()
+        self.log_webhook(f"Renamed ADB device {ip} to: {name}")
+        console.print(f"[green]Renamed ADB device {ip} to: {name}[/green]")
+
     def set_preferred_device(self, ip):
         """Set the preferred ADB device for extraction"""
-        adb_ips = self.config.get('adb_ips', [])
-        device_name = None
-        
-        # Find the device and get its name
-        for device in adb_ips:
-            device_ip = device.get('ip', device)
-            if device_ip == ip:
-                device_name = device.get('name', ip) if isinstance(device, dict) else ip
-                break
-        
+        device = self._adb_index.get(ip)
+        device_name = device.get('name', ip) if device else None
+
         # Set as preferred device
         self.config['preferred_device'] = ip
         self.save_config()
-        
+
         self.log_webhook(f"Set preferred device to: {ip} ({device_name})")
         console.print(f"[green]Set preferred device to: {ip} ({device_name})[/green]")
-        
+
         return device_name
-    
+
     def get_adb_ips(self):
         """Get list of ADB IP addresses with names"""
-        adb_ips = self.config.get('adb_ips', [])
-        # Convert old format (strings) to new format (objects)
-        result = []
-        for device in adb_ips:
-            if isinstance(device, dict):
-                result.append(device)
-            else:
-                # Old format - convert to new format
-                result.append({'ip': device, 'name': f'Device {len(result) + 1}'})
-        return result
+        return list(self._adb_index.values())
     
     def try_connect_adb_ips(self):
         """Try to connect to ADB devices using stored IPs"""
@@ -702,8 +807,10 @@ class BTTAutoManager:
             ip = device.get('ip', device)
             try:
                 # Try to connect to the IP
-                result = subprocess.run(f'adb connect {ip}', shell=True, capture_output=True, text=True, timeout=10)
+                result = subprocess.run(['adb', 'connect', ip], capture_output=True, text=True, timeout=10)
                 if result.returncode == 0 and 'connected' in result.stdout.lower():
+                    invalidate_device_cache()
+                    self._adb_snapshot = None
                     self.log_webhook(f"Successfully connected to ADB device: {ip}")
                     console.print(f"[green]Connected to ADB device: {ip}[/green]")
                     return True
@@ -712,129 +819,222 @@ class BTTAutoManager:
         
         return False
     
-    def test_adb_connection(self, ip):
-        """Test if an ADB device is connected at the specified IP"""
-        command_output = ""
+    def try_connect_adb_ips_parallel(self):
+        """Try to connect to all stored ADB IPs concurrently.
+
+        Each adb connect is an independent network round trip, so testing N
+        devices takes roughly one connect timeout instead of N. Returns a
+        list of (ip, connected) pairs in config order.
+        """
+        ips = [device.get('ip', device) for device in self.config.get('adb_ips', [])]
+        if not ips:
+            return []
+
+        def connect(ip):
+            try:
+                result = subprocess.run(['adb', 'connect', ip],
+                                        capture_output=True, text=True, timeout=5)
+                return result.returncode == 0 and 'connected' in result.stdout.lower()
+            except Exception as e:
+                self.log_webhook(f"Failed to connect to {ip}: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=min(16, len(ips))) as executor:
+            results = list(zip(ips, executor.map(connect, ips)))
+        for ip, connected in results:
+            if connected:
+                invalidate_device_cache()
+                self._adb_snapshot = None
+                self.log_webhook(f"Successfully connected to ADB device: {ip}")
+        return results
+
+    _ADB_RECONNECT_INTERVAL = 30.0
+
+    def maybe_reconnect_adb(self):
+        """Attempt an adb reconnect, rate-limited to one try per interval.
+
+        /status polls arrive at ~1Hz; when a wifi-adb link drops we want one
+        cheap adb connect attempt before concluding the device is gone, not
+        a connect storm on every poll. Returns True if a device connected.
+        """
+        now = time.monotonic()
+        if now - self._last_reconnect_ts < self._ADB_RECONNECT_INTERVAL:
+            return False
+        self._last_reconnect_ts = now
+        return self.try_connect_adb_ips()
+
+    def test_adb_connection(self, ip, verbose=True):
+        """Test if an ADB device is connected at the specified IP
+
+        With verbose=False the command transcript is not built at all, which
+        skips dozens of string allocations for callers (connection sweeps)
+        that only care about the resulting state.
+        """
+        parts = []
         try:
-            # First ping the IP to check if device is reachable
-            ping_result = subprocess.run(f'ping -c 1 -W 3 {ip.split(":")[0]}', shell=True, capture_output=True, text=True, timeout=5)
-            command_output += f"$ ping -c 1 -W 3 {ip.split(':')[0]}\n"
-            command_output += f"Return code: {ping_result.returncode}\n"
-            command_output += f"Output: {ping_result.stdout}\n"
-            if ping_result.stderr:
-                command_output += f"Error: {ping_result.stderr}\n"
-            
+            # First ping the IP to check if device is reachable; argv form
+            # avoids forking an intermediate shell per probe
+            ping_result = subprocess.run(['ping', '-c', '1', '-W', '3', ip.split(':')[0]], capture_output=True, text=True, timeout=5)
+            if verbose:
+                parts.append(f"$ ping -c 1 -W 3 {ip.split(':')[0]}\n")
+                parts.append(f"Return code: {ping_result.returncode}\n")
+                parts.append(f"Output: {ping_result.stdout}\n")
+                if ping_result.stderr:
+                    parts.append(f"Error: {ping_result.stderr}\n")
+
             if ping_result.returncode != 0:
                 self.log_webhook(f"Ping test FAIL for {ip} - device not reachable")
-                command_output += f"\n❌ Device is not reachable via ping - Android may be offline or device disconnected\n"
-                return (False, command_output, False)  # (connected, output, unauthorized)
-            
-            command_output += f"\n✅ Device is reachable via ping - proceeding with ADB connection test\n\n"
-            
+                if verbose:
+                    parts.append(f"\n❌ Device is not reachable via ping - Android may be offline or device disconnected\n")
+                return (False, ''.join(parts), False)  # (connected, output, unauthorized)
+
+            if verbose:
+                parts.append(f"\n✅ Device is reachable via ping - proceeding with ADB connection test\n\n")
+
             # Now try to connect to the IP via ADB
-            result = subprocess.run(f'adb connect {ip}', shell=True, capture_output=True, text=True, timeout=10)
-            command_output += f"$ adb connect {ip}\n"
-            command_output += f"Return code: {result.returncode}\n"
-            command_output += f"Output: {result.stdout}\n"
-            if result.stderr:
-                command_output += f"Error: {result.stderr}\n"
-            
+            result = subprocess.run(['adb', 'connect', ip], capture_output=True, text=True, timeout=10)
+            if verbose:
+                parts.append(f"$ adb connect {ip}\n")
+                parts.append(f"Return code: {result.returncode}\n")
+                parts.append(f"Output: {result.stdout}\n")
+                if result.stderr:
+                    parts.append(f"Error: {result.stderr}\n")
+
             if result.returncode == 0 and 'connected' in result.stdout.lower():
                 # Now check if the device is actually connected
-                devices_result = subprocess.run('adb devices', shell=True, capture_output=True, text=True, timeout=5)
-                command_output += f"\n$ adb devices\n"
-                command_output += f"Return code: {devices_result.returncode}\n"
-                command_output += f"Output: {devices_result.stdout}\n"
-                if devices_result.stderr:
-                    command_output += f"Error: {devices_result.stderr}\n"
-                
+                devices_result = subprocess.run(['adb', 'devices'], capture_output=True, text=True, timeout=5)
+                if verbose:
+                    parts.append(f"\n$ adb devices\n")
+                    parts.append(f"Return code: {devices_result.returncode}\n")
+                    parts.append(f"Output: {devices_result.stdout}\n")
+                    if devices_result.stderr:
+                        parts.append(f"Error: {devices_result.stderr}\n")
+
                 if devices_result.returncode == 0:
-                    lines = devices_result.stdout.splitlines()
-                    for line in lines[1:]:  # Skip the first line (header)
-                        if ip in line:
-                            if 'unauthorized' in line:
-                                self.log_webhook(f"ADB connection test UNAUTHORIZED for {ip}")
-                                command_output += f"\n❌ ADB connection failed - device is UNAUTHORIZED\n"
-                                return (False, command_output, True)
-                            if 'device' in line and 'offline' not in line:
-                                self.log_webhook(f"ADB connection test PASS for {ip}")
-                                command_output += f"\n✅ ADB connection successful - device is online and ready\n"
-                                return (True, command_output, False)
-                
+                    # Anchored match of "<ip>\t<state>"; one regex instead of
+                    # several substring scans, and immune to the IP appearing
+                    # inside another device's serial
+                    state_match = re.search(rf'^{re.escape(ip)}\s+(\S+)', devices_result.stdout, re.MULTILINE)
+                    state = state_match.group(1) if state_match else None
+                    if state == 'unauthorized':
+                        self.log_webhook(f"ADB connection test UNAUTHORIZED for {ip}")
+                        if verbose:
+                            parts.append(f"\n❌ ADB connection failed - device is UNAUTHORIZED\n")
+                        return (False, ''.join(parts), True)
+                    if state == 'device':
+                        self.log_webhook(f"ADB connection test PASS for {ip}")
+                        if verbose:
+                            parts.append(f"\n✅ ADB connection successful - device is online and ready\n")
+                        return (True, ''.join(parts), False)
+
                 self.log_webhook(f"ADB connection test FAIL for {ip} - device not found in device list")
-                command_output += f"\n❌ ADB connection failed - device not found in device list\n"
-                return (False, command_output, False)
+                if verbose:
+                    parts.append(f"\n❌ ADB connection failed - device not found in device list\n")
+                return (False, ''.join(parts), False)
             else:
                 self.log_webhook(f"ADB connection test FAIL for {ip} - connection failed")
-                command_output += f"\n❌ ADB connection failed - Android may be offline or ADB not enabled\n"
-                return (False, command_output, False)
+                if verbose:
+                    parts.append(f"\n❌ ADB connection failed - Android may be offline or ADB not enabled\n")
+                return (False, ''.join(parts), False)
         except Exception as e:
-            command_output += f"\nException: {e}\n"
+            if verbose:
+                parts.append(f"\nException: {e}\n")
             self.log_webhook(f"ADB connection test ERROR for {ip}: {e}")
-            return (False, command_output, False)
+            return (False, ''.join(parts), False)
     
+    # How long a parsed `adb devices -l` snapshot stays valid
+    _ADB_SNAPSHOT_TTL = 3.0
+
+    def _adb_devices_snapshot(self):
+        """Map of device serial -> (connected, unauthorized) from one `adb devices -l` call.
+
+        The result is cached for a few seconds so that status/adb-ips polling
+        costs one adb fork per TTL window instead of one per device per request.
+        """
+        if self._adb_snapshot is not None and time.monotonic() - self._adb_snapshot_ts < self._ADB_SNAPSHOT_TTL:
+            return self._adb_snapshot
+        # Serialize refreshes so concurrent requests hitting a cold cache
+        # fork one adb process, not one each
+        with self._adb_snapshot_lock:
+            now = time.monotonic()
+            if self._adb_snapshot is not None and now - self._adb_snapshot_ts < self._ADB_SNAPSHOT_TTL:
+                return self._adb_snapshot
+            states = {}
+            try:
+                result = subprocess.run(['adb', 'devices', '-l'], capture_output=True, text=True, timeout=5)
+                if result.returncode == 0:
+                    for line in result.stdout.splitlines()[1:]:
+                        parts = line.split()
+                        if len(parts) < 2:
+                            continue
+                        serial, state = parts[0], parts[1]
+                        states[serial] = (state == 'device', state == 'unauthorized')
+            except Exception as e:
+                self.log_webhook(f"adb devices snapshot failed: {e}")
+            self._adb_snapshot = states
+            self._adb_snapshot_ts = now
+            return states
+
+    def adb_device_state(self, ip):
+        """Cheap (connected, unauthorized) lookup from the cached device snapshot"""
+        return self._adb_devices_snapshot().get(ip, (False, False))
+
     def log_webhook(self, message):
         """Log webhook activity"""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         log_entry = f"[{timestamp}] {message}"
+        # Bounded deque: append is O(1) and the oldest entry is evicted automatically
         self.webhook_logs.append(log_entry)
-        # Keep only last 100 log entries
-        if len(self.webhook_logs) > 100:
-            self.webhook_logs = self.webhook_logs[-100:]
     
-    def extract_sqlite_data(self, db_path):
+    def extract_sqlite_data(self, db_path, conn=None):
         logger.log(f'extract_sqlite_data START: {db_path}')
-        """Extract data from SQLite database"""
+        """Extract data from SQLite database
+
+        An already-open connection can be passed in so callers that hold one
+        (e.g. update_last_stats) avoid a second open/schema-parse cycle.
+        """
         try:
             if not os.path.exists(db_path):
                 self.log_webhook(f"Database file not found: {db_path}")
                 logger.log(f"Database file not found: {db_path}")
                 return None
-            
-            conn = sqlite3.connect(db_path)
+
+            own_conn = conn is None
+            if own_conn:
+                conn = sqlite3.connect(db_path)
             cursor = conn.cursor()
-            
-            # Extract DWJJOB data
+            # Row factory materializes the dicts during fetch, so there is no
+            # second Python-level pass over the rows
+            cursor.row_factory = _dict_row
+
+            # Both tables are fully materialized on purpose: extracted_data
+            # backs the /webhook/dwjjob and /webhook/dwvveh payloads and the
+            # per-load indices, so every row is needed in memory anyway
             cursor.execute("SELECT * FROM DWJJOB")
-            dwjjob_rows = cursor.fetchall()
-            
-            # Get column names for DWJJOB
-            cursor.execute("PRAGMA table_info(DWJJOB)")
-            dwjjob_columns = [col[1] for col in cursor.fetchall()]
-            
+            dwjjob_data = cursor.fetchall()
+
             # Extract DWVVEH data
             cursor.execute("SELECT * FROM DWVVEH")
-            dwvveh_rows = cursor.fetchall()
-            
-            # Get column names for DWVVEH
-            cursor.execute("PRAGMA table_info(DWVVEH)")
-            dwvveh_columns = [col[1] for col in cursor.fetchall()]
-            
-            conn.close()
-            
-            # Convert to list of dictionaries
-            dwjjob_data = []
-            for row in dwjjob_rows:
-                row_dict = {}
-                for i, value in enumerate(row):
-                    if i < len(dwjjob_columns):
-                        row_dict[dwjjob_columns[i]] = value if value is not None else ''
-                dwjjob_data.append(row_dict)
-            
-            dwvveh_data = []
-            for row in dwvveh_rows:
-                row_dict = {}
-                for i, value in enumerate(row):
-                    if i < len(dwvveh_columns):
-                        row_dict[dwvveh_columns[i]] = value if value is not None else ''
-                dwvveh_data.append(row_dict)
+            dwvveh_data = cursor.fetchall()
+
+            if own_conn:
+                conn.close()
             
+            self._last_processed_epoch = time.time()
             self.extracted_data = {
                 'DWJJOB': dwjjob_data,
                 'DWVVEH': dwvveh_data,
-                'lastProcessed': datetime.now().isoformat(),
+                'lastProcessed': datetime.fromtimestamp(self._last_processed_epoch).isoformat(),
                 'processingStatus': 'processed'
             }
+            self._rebuild_load_indices(dwjjob_data, dwvveh_data)
+            # Fresh data invalidates the cached status payload immediately
+            self._status_cache = None
+            # Materialize the webhook payloads now so requests are lookups
+            self._load_numbers_cache = self._compute_load_numbers()
+            self._load_details_cache = {
+                load: self._compute_load_details(load) for load in self._dwjjob_by_load
+            }
             logger.log(f"Extracted {len(dwjjob_data)} DWJJOB and {len(dwvveh_data)} DWVVEH records")
             self.log_webhook(f"Extracted {len(dwjjob_data)} DWJJOB records and {len(dwvveh_data)} DWVVEH records")
             return self.extracted_data
@@ -845,6 +1045,21 @@ class BTTAutoManager:
             self.extracted_data['processingStatus'] = 'error'
             return None
     
+    def _rebuild_load_indices(self, dwjjob_data, dwvveh_data):
+        """Index both tables by load number so per-load lookups are O(1)"""
+        dwjjob_by_load = collections.defaultdict(list)
+        for row in dwjjob_data:
+            load = row.get('dwjLoad')
+            if load:
+                dwjjob_by_load[str(load)].append(row)
+        dwvveh_by_load = collections.defaultdict(list)
+        for row in dwvveh_data:
+            load = row.get('dwvLoad')
+            if load:
+                dwvveh_by_load[str(load)].append(row)
+        self._dwjjob_by_load = dwjjob_by_load
+        self._dwvveh_by_load = dwvveh_by_load
+
     def get_dwjjob_data(self):
         """Get DWJJOB data for webhook"""
         return self.extracted_data.get('DWJJOB', [])
@@ -855,23 +1070,26 @@ class BTTAutoManager:
     
     def get_load_numbers(self):
         """Get list of load numbers from DWJJOB data"""
+        if self._load_numbers_cache is not None:
+            return self._load_numbers_cache
+        return self._compute_load_numbers()
+
+    def _compute_load_numbers(self):
+        """Aggregate the load-numbers payload from the extracted DWJJOB rows"""
         try:
             dwjjob_data = self.extracted_data.get('DWJJOB', [])
-            load_numbers = []
-            
-            # Extract unique load numbers from DWJJOB data
-            seen_loads = set()
-            for record in dwjjob_data:
-                load_number = record.get('dwjLoad')
-                if load_number and load_number not in seen_loads:
-                    seen_loads.add(load_number)
-                    load_numbers.append({
-                        'loadNumber': load_number,
-                        'count': sum(1 for r in dwjjob_data if r.get('dwjLoad') == load_number)
-                    })
-            
-            # Sort by load number
-            load_numbers.sort(key=lambda x: x['loadNumber'])
+
+            # Count records per load in a single pass instead of re-scanning
+            # the whole table for every unique load number
+            counts = collections.Counter(
+                r.get('dwjLoad') for r in dwjjob_data if r.get('dwjLoad')
+            )
+            load_numbers = [
+                {'loadNumber': load, 'count': count} for load, count in counts.items()
+            ]
+
+            # Sort by load number, numerically where possible
+            load_numbers.sort(key=_load_number_key)
             
             return {
                 'loadNumbers': load_numbers,
@@ -889,15 +1107,33 @@ class BTTAutoManager:
     
     def get_load_details(self, load_number):
         """Return all loads/cars for a given load number, with code-letter linking for UI"""
-        dwjjob = self.extracted_data.get('DWJJOB', [])
-        dwvveh = self.extracted_data.get('DWVVEH', [])
-        # Filter jobs for this load
-        jobs = [row for row in dwjjob if str(row.get('dwjLoad')) == str(load_number)]
-        # Assign letters to unique collection and delivery codes
-        col_codes = sorted(set(row.get('dwjAdrCod') for row in jobs if row.get('dwjType') == 'C' and row.get('dwjAdrCod')))
-        del_codes = sorted(set(row.get('dwjAdrCod') for row in jobs if row.get('dwjType') == 'D' and row.get('dwjAdrCod')))
-        col_code_to_letter = {code: chr(65+i) for i, code in enumerate(col_codes)}  # A, B, C...
-        del_code_to_letter = {code: chr(65+i) for i, code in enumerate(del_codes)}
+        cached = self._load_details_cache.get(str(load_number))
+        if cached is not None:
+            return cached
+        return self._compute_load_details(load_number)
+
+    def _compute_load_details(self, load_number):
+        """Build the load-details payload for one load from the indexed rows"""
+        # Partition jobs for this load into collections/deliveries and gather
+        # the unique address codes in a single pass over the indexed rows
+        load_str = str(load_number)
+        col_rows = []
+        del_rows = []
+        col_codes = set()
+        del_codes = set()
+        for row in self._dwjjob_by_load.get(load_str, []):
+            job_type = row.get('dwjType')
+            if job_type == 'C':
+                col_rows.append(row)
+                if row.get('dwjAdrCod'):
+                    col_codes.add(row['dwjAdrCod'])
+            elif job_type == 'D':
+                del_rows.append(row)
+                if row.get('dwjAdrCod'):
+                    del_codes.add(row['dwjAdrCod'])
+        # Assign letters to unique collection and delivery codes (A, B, C...)
+        col_code_to_letter = dict(zip(sorted(col_codes), _LETTERS))
+        del_code_to_letter = dict(zip(sorted(del_codes), _LETTERS))
         # Collections and deliveries with letters
         collections = [
             {
@@ -908,7 +1144,7 @@ class BTTAutoManager:
                 'dwjLong': row.get('dwjLong', ''),
                 'letter': col_code_to_letter.get(row.get('dwjAdrCod'), '')
             }
-            for row in jobs if row.get('dwjType') == 'C'
+            for row in col_rows
         ]
         deliveries = [
             {
@@ -919,20 +1155,20 @@ class BTTAutoManager:
                 'dwjLong': row.get('dwjLong', ''),
                 'letter': del_code_to_letter.get(row.get('dwjAdrCod'), '')
             }
-            for row in jobs if row.get('dwjType') == 'D'
+            for row in del_rows
         ]
-        # Filter vehicles for this load, and link to collection/delivery by code
+        # Vehicles for this load come straight from the index, linked to
+        # collection/delivery by code
         vehicles = []
-        for row in dwvveh:
-            if str(row.get('dwvLoad')) == str(load_number):
-                col_letter = col_code_to_letter.get(row.get('dwvColCod'), '')
-                del_letter = del_code_to_letter.get(row.get('dwvDelCod'), '')
-                vehicles.append({
-                    'dwvVehRef': row.get('dwvVehRef', ''),
-                    'dwvModDes': row.get('dwvModDes', ''),
-                    'colLetter': col_letter,
-                    'delLetter': del_letter
-                })
+        for row in self._dwvveh_by_load.get(load_str, []):
+            col_letter = col_code_to_letter.get(row.get('dwvColCod'), '')
+            del_letter = del_code_to_letter.get(row.get('dwvDelCod'), '')
+            vehicles.append({
+                'dwvVehRef': row.get('dwvVehRef', ''),
+                'dwvModDes': row.get('dwvModDes', ''),
+                'colLetter': col_letter,
+                'delLetter': del_letter
+            })
         return {
             'loadNumber': load_number,
             'collections': collections,
@@ -945,6 +1181,20 @@ class BTTAutoManager:
 
     def get_status_data(self):
         """Get status data for webhook"""
+        # Dashboard polling hits this at ~1Hz; serve a cached copy for up to
+        # a second and refresh only the clock-derived fields
+        now_mono = time.monotonic()
+        if self._status_cache is not None and now_mono - self._status_cache_ts < 1.0:
+            status = dict(self._status_cache)
+            uptime_seconds = time.time() - getattr(self, '_start_time', time.time())
+            status['serverTime'] = datetime.now().isoformat()
+            status['uptime'] = uptime_seconds
+            status['uptimeFormatted'] = self.format_uptime(uptime_seconds)
+            if status.get('timeSinceLastUpdate') is not None:
+                elapsed_ms = int((now_mono - self._status_cache_ts) * 1000)
+                status['timeSinceLastUpdate'] += elapsed_ms
+                status['timeSinceLastUpdateFormatted'] = self.format_time_difference(status['timeSinceLastUpdate'] / 1000)
+            return status
         now = datetime.now()
         last_processed = self.extracted_data.get('lastProcessed')
         time_since_last_update = None
@@ -952,18 +1202,15 @@ class BTTAutoManager:
         next_update_time = self.next_update_time.isoformat() if self.next_update_time else None
         uptime_seconds = time.time() - getattr(self, '_start_time', time.time())
         uptime_formatted = self.format_uptime(uptime_seconds)
-        if last_processed:
-            try:
-                last_time = datetime.fromisoformat(last_processed.replace('Z', '+00:00'))
-                time_diff = now - last_time.replace(tzinfo=None)
-                time_since_last_update = int(time_diff.total_seconds() * 1000)
-                time_since_last_update_formatted = self.format_time_difference(time_diff.total_seconds())
-                if not next_update_time and self.config.get('auto_enabled', False):
-                    interval_minutes = self.config.get('interval_minutes', 5)
-                    next_update_time = (last_time.replace(tzinfo=None) + timedelta(minutes=interval_minutes)).isoformat()
-            except:
-                pass
-        return {
+        if last_processed and self._last_processed_epoch is not None:
+            diff_seconds = time.time() - self._last_processed_epoch
+            time_since_last_update = int(diff_seconds * 1000)
+            time_since_last_update_formatted = self.format_time_difference(diff_seconds)
+            if not next_update_time and self.config.get('auto_enabled', False):
+                interval_minutes = self.config.get('interval_minutes', 5)
+                next_update_time = datetime.fromtimestamp(
+                    self._last_processed_epoch + interval_minutes * 60).isoformat()
+        status = {
             'status': self.extracted_data.get('processingStatus', 'idle'),
             'lastProcessed': last_processed,
             'timeSinceLastUpdate': time_since_last_update,
@@ -984,6 +1231,9 @@ class BTTAutoManager:
             'adbIps': self.config.get('adb_ips', []),
             'preferredDevice': self.config.get('preferred_device', None)
         }
+        self._status_cache = dict(status)
+        self._status_cache_ts = now_mono
+        return status
 
     def format_uptime(self, seconds):
         seconds = int(seconds)
@@ -1034,7 +1284,10 @@ class BTTAutoManager:
             console.print(f"[blue]Starting webhook server on {host}:{port}...[/blue]")
             self.log_webhook(f"Attempting to start webhook server on {host}:{port}")
             
-            self.webhook_server = HTTPServer((host, port), handler_factory)
+            # ThreadingHTTPServer handles each request on its own thread, so
+            # dashboard polls are not serialized behind long-running adb or
+            # sqlite work happening in another handler
+            self.webhook_server = ThreadingHTTPServer((host, port), handler_factory)
             self.webhook_thread = threading.Thread(target=self.webhook_server.serve_forever, daemon=True)
             self.webhook_thread.start()
             
@@ -1047,7 +1300,6 @@ class BTTAutoManager:
             error_msg = f"Failed to start webhook server: {e}"
             console.print(f"[red]{error_msg}[/red]")
             self.log_webhook(error_msg)
-            import traceback
             console.print(f"[red]Traceback: {traceback.format_exc()}[/red]")
     
     def stop_webhook_server(self):
@@ -1064,32 +1316,36 @@ class BTTAutoManager:
         """Update last known statistics from the database"""
         try:
             db_path = LOCAL_DB_PATH
-            if os.path.exists(db_path):
-                # Get file stats
+            # Single stat covers both the presence check and the timestamps,
+            # and avoids the exists/stat race window
+            try:
                 stat = os.stat(db_path)
+            except FileNotFoundError:
+                stat = None
+            if stat is not None:
                 atime = datetime.fromtimestamp(stat.st_atime).strftime('%Y-%m-%d %H:%M:%S')
-                
-                # Get database counts
-                conn = sqlite3.connect(db_path)
-                cursor = conn.cursor()
-                
-                # Get DWJJOB count
-                cursor.execute("SELECT COUNT(*) FROM DWJJOB")
-                locations = cursor.fetchone()[0]
-                
-                # Get DWVVEH count
-                cursor.execute("SELECT COUNT(*) FROM DWVVEH")
-                cars = cursor.fetchone()[0]
-                
-                # Get unique loads count
-                cursor.execute("SELECT COUNT(DISTINCT dwjLoad) FROM DWJJOB WHERE dwjLoad IS NOT NULL")
-                loads = cursor.fetchone()[0]
-                
-                conn.close()
-                
-                # Extract data for webhooks
-                self.extract_sqlite_data(db_path)
-                
+
+                # Extract data for webhooks on a single connection and derive
+                # the counts from the rows we already fetched, instead of
+                # issuing separate COUNT queries on a second connection.
+                # The pulled snapshot is never written by this process, so
+                # open read-only and immutable — SQLite skips locking and
+                # journal checks entirely — and read via mmap
+                conn = sqlite3.connect(f'file:{db_path}?mode=ro&immutable=1', uri=True)
+                try:
+                    conn.execute('PRAGMA temp_store=MEMORY')
+                    conn.execute('PRAGMA mmap_size=268435456')
+                    extracted = self.extract_sqlite_data(db_path, conn=conn)
+                finally:
+                    conn.close()
+                if not extracted:
+                    return
+
+                dwjjob_data = extracted.get('DWJJOB', [])
+                locations = len(dwjjob_data)
+                cars = len(extracted.get('DWVVEH', []))
+                loads = len({r.get('dwjLoad') for r in dwjjob_data if r.get('dwjLoad')})
+
                 self.config.update({
                     "last_sql_atime": atime,
                     "last_locations": locations,
@@ -1108,8 +1364,16 @@ class BTTAutoManager:
         """Run the SQL extraction process"""
         try:
             console.print("[blue]Running SQL extraction...[/blue]")
+            # Seed the root-method cache from config so a restart doesn't
+            # re-pay the full probe fan-out on its first extraction
+            last_methods = self.config.setdefault('last_root_method', {})
+            for serial, method in last_methods.items():
+                _root_method_cache.setdefault(serial, method)
             # Use the consolidated extraction function
             result = extract_sqlite_data_from_device()
+            if last_methods != _root_method_cache:
+                self.config['last_root_method'] = dict(_root_method_cache)
+                self.save_config()
             output = {
                 'result': result["result"] if isinstance(result, dict) else result,
                 'success': result.get("success", result == "SUCCESS") if isinstance(result, dict) else (result == "SUCCESS"),
@@ -1120,7 +1384,10 @@ class BTTAutoManager:
                 self.last_run = datetime.now()
                 self.update_last_stats()
             else:
-                console.print(f"[red]SQL extraction failed: {output['result']}\nDebug: {output['debug']}[/red]")
+                # Debug entries embed raw ADB output; style via argument so
+                # stray brackets in it can't break markup parsing
+                console.print(f"SQL extraction failed: {output['result']}\nDebug: {output['debug']}",
+                              style="red", markup=False)
             return output
         except Exception as e:
             console.print(f"[red]Error running SQL extraction: {e}[/red]")
@@ -1130,6 +1397,41 @@ class BTTAutoManager:
         """Run getsql for webhook calls synchronously and return output"""
         self.log_webhook("SQL extraction started via webhook")
         return self.run_getsql()
+
+    def run_getsql_all(self):
+        """Run the SQL extraction against every configured device in parallel.
+
+        Each device pulls into its own serial-suffixed database; the
+        preferred device's pull (or the first successful one) is then
+        promoted to LOCAL_DB_PATH so stats and webhook payloads refresh.
+        Returns {serial: result dict}.
+        """
+        ips = [device.get('ip', device) for device in self.config.get('adb_ips', [])]
+        if not ips:
+            console.print("[yellow]No ADB IP addresses configured[/yellow]")
+            return {}
+        console.print(f"[blue]Running SQL extraction on {len(ips)} device(s)...[/blue]")
+        results = extract_from_all_devices(ips)
+        for serial, result in results.items():
+            if result.get('success'):
+                console.print(f"[green]Extraction succeeded for {serial}[/green]")
+            else:
+                console.print(f"Extraction failed for {serial}: {result.get('result')}",
+                              style="red", markup=False)
+            self.log_webhook(f"Extraction for {serial}: {result.get('result')}")
+        preferred = self.config.get('preferred_device')
+        if preferred and results.get(preferred, {}).get('success'):
+            chosen = preferred
+        else:
+            chosen = next((serial for serial in ips if results.get(serial, {}).get('success')), None)
+        if chosen:
+            try:
+                os.replace(_device_db_path(chosen), LOCAL_DB_PATH)
+            except OSError as e:
+                self.log_webhook(f"Could not promote {chosen} database: {e}")
+            self.last_run = datetime.now()
+            self.update_last_stats()
+        return results
     
     def toggle_auto_update_webhook(self):
         current_state = self.config.get("auto_enabled", False)
@@ -1142,18 +1444,26 @@ class BTTAutoManager:
             self.log_webhook(f"DEBUG: Config after toggle: {self.config.get('auto_enabled', False)}")
             return {'success': True, 'status': 'success', 'autoEnabled': new_state}
         else:
-            # Allow toggling ON if ANY ADB device is connected (not just preferred)
+            # Allow toggling ON if ANY ADB device is connected (not just
+            # preferred); probe all devices concurrently so the worst case is
+            # one probe timeout rather than one per device
             adb_ips = self.get_adb_ips()
             any_connected = False
-            for device in adb_ips:
-                ip = device.get('ip', device)
-                try:
-                    connected, _, _ = self.test_adb_connection(ip)
-                    if connected:
-                        any_connected = True
-                        break
-                except Exception as e:
-                    self.log_webhook(f"Error testing ADB connection for {ip}: {e}")
+            if adb_ips:
+                with ThreadPoolExecutor(max_workers=min(8, len(adb_ips))) as executor:
+                    futures = {
+                        executor.submit(self.test_adb_connection, device.get('ip', device), False): device
+                        for device in adb_ips
+                    }
+                    for future in as_completed(futures):
+                        ip = futures[future].get('ip', futures[future])
+                        try:
+                            connected, _, _ = future.result()
+                            if connected:
+                                any_connected = True
+                                break
+                        except Exception as e:
+                            self.log_webhook(f"Error testing ADB connection for {ip}: {e}")
             if not any_connected:
                 self.log_webhook("DEBUG: Cannot enable auto-update, no ADB device connected.")
                 return {'success': False, 'status': 'error', 'error': 'No ADB device connected. Cannot enable auto-update.'}
@@ -1164,6 +1474,34 @@ class BTTAutoManager:
             self.log_webhook(f"DEBUG: Config after toggle: {self.config.get('auto_enabled', False)}")
             return {'success': True, 'status': 'success', 'autoEnabled': new_state}
     
+    # How long a verified ADB connection is trusted without re-probing
+    _ADB_VERIFY_TTL = 300.0
+
+    def _ensure_adb_connection(self):
+        """Return True if an ADB device is connected, reconnecting only when needed.
+
+        A connection verified within the TTL is trusted outright, so
+        steady-state auto-update ticks spawn no adb processes at all; the
+        cache is invalidated when an extraction actually fails.
+        """
+        now = time.monotonic()
+        if self._adb_connected_ip and now - self._adb_last_verified_ts < self._ADB_VERIFY_TTL:
+            return True
+        device = get_connected_device()
+        if not device and self.try_connect_adb_ips():
+            device = get_connected_device()
+        if device:
+            self._adb_connected_ip = device
+            self._adb_last_verified_ts = now
+            return True
+        self._adb_connected_ip = None
+        return False
+
+    def _invalidate_adb_connection(self):
+        """Force the next auto-update tick to re-verify the ADB connection"""
+        self._adb_connected_ip = None
+        self._adb_last_verified_ts = 0.0
+
     def auto_update_loop(self):
         """Main loop for auto-updating"""
         self.log_webhook(f"DEBUG: auto_update_loop started. running={self.running}, auto_enabled={self.config.get('auto_enabled', False)}")
@@ -1176,17 +1514,18 @@ class BTTAutoManager:
                     break
                 
                 # Try to connect to ADB devices if needed
-                if not get_connected_device():
-                    connected = self.try_connect_adb_ips()
-                    if not connected:
-                        msg = "[yellow]No ADB device connected. Retrying in 60 seconds...[/yellow]"
-                        self.log_webhook("No ADB device connected. Retrying in 60 seconds...")
-                        console.print(msg)
-                        time.sleep(60)
-                        continue
-                
-                # Run getsql
-                self.run_getsql()
+                if not self._ensure_adb_connection():
+                    msg = "[yellow]No ADB device connected. Retrying in 60 seconds...[/yellow]"
+                    self.log_webhook("No ADB device connected. Retrying in 60 seconds...")
+                    console.print(msg)
+                    time.sleep(60)
+                    continue
+
+                # Run getsql; a failed extraction usually means the device
+                # dropped, so stop trusting the cached connection
+                output = self.run_getsql()
+                if isinstance(output, dict) and not output.get('success'):
+                    self._invalidate_adb_connection()
                 
                 # Set next update time
                 interval_seconds = self.config.get("interval_minutes", 5) * 60
@@ -1307,27 +1646,28 @@ class BTTAutoManager:
         
         return Panel(status_text, title="BTT Auto Manager", style="blue")
     
+    def _build_menu_table(self):
+        """Build the static main menu table (the rows never change)"""
+        menu_table = Table(box=box.SIMPLE, title="Menu Options")
+        menu_table.add_column("Option", style="bold")
+        menu_table.add_column("Description")
+
+        menu_table.add_row("1", "Toggle Auto-Update")
+        menu_table.add_row("2", "Set Update Interval")
+        menu_table.add_row("3", "Run SQL Extraction Now")
+        menu_table.add_row("4", "Update Status")
+        menu_table.add_row("5", "Toggle Webhook Server")
+        menu_table.add_row("6", "Show Webhook Logs")
+        menu_table.add_row("7", "Manage ADB IP Addresses")
+        menu_table.add_row("8", "Exit")
+        return menu_table
+
     def show_menu(self):
         """Show the main menu"""
         while True:
             console.clear()
-            console.print(self.create_status_display())
-            
-            # Menu options
-            menu_table = Table(box=box.SIMPLE, title="Menu Options")
-            menu_table.add_column("Option", style="bold")
-            menu_table.add_column("Description")
-            
-            menu_table.add_row("1", "Toggle Auto-Update")
-            menu_table.add_row("2", "Set Update Interval")
-            menu_table.add_row("3", "Run SQL Extraction Now")
-            menu_table.add_row("4", "Update Status")
-            menu_table.add_row("5", "Toggle Webhook Server")
-            menu_table.add_row("6", "Show Webhook Logs")
-            menu_table.add_row("7", "Manage ADB IP Addresses")
-            menu_table.add_row("8", "Exit")
-            
-            console.print(menu_table)
+            # One render pass (and one terminal flush) for panel plus menu
+            console.print(Group(self.create_status_display(), self._main_menu_table))
             
             choice = console.input("\n[bold]Select option (1-8): [/bold]").strip()
             
@@ -1401,9 +1741,10 @@ class BTTAutoManager:
             console.print("1. Add IP address")
             console.print("2. Remove IP address")
             console.print("3. Test connections")
-            console.print("4. Back to main menu")
-            
-            choice = console.input("\n[bold]Select option (1-4): [/bold]").strip()
+            console.print("4. Extract from all devices")
+            console.print("5. Back to main menu")
+
+            choice = console.input("\n[bold]Select option (1-5): [/bold]").strip()
             
             if choice == "1":
                 ip = console.input("Enter IP address (e.g., 192.168.1.100:5555): ").strip()
@@ -1426,12 +1767,19 @@ class BTTAutoManager:
                 console.input("\nPress Enter to continue...")
             elif choice == "3":
                 console.print("[blue]Testing ADB connections...[/blue]")
-                if self.try_connect_adb_ips():
-                    console.print("[green]Successfully connected to at least one device[/green]")
-                else:
+                results = self.try_connect_adb_ips_parallel()
+                for ip, connected in results:
+                    if connected:
+                        console.print(f"[green]Connected to ADB device: {ip}[/green]")
+                    else:
+                        console.print(f"[red]Failed to connect to: {ip}[/red]")
+                if not any(connected for _, connected in results):
                     console.print("[red]Failed to connect to any devices[/red]")
                 console.input("\nPress Enter to continue...")
             elif choice == "4":
+                self.run_getsql_all()
+                console.input("\nPress Enter to continue...")
+            elif choice == "5":
                 break
             else:
                 console.print("[red]Invalid option[/red]")
@@ -1445,16 +1793,24 @@ class BTTAutoManager:
         if not self.webhook_logs:
             console.print("[yellow]No webhook logs available[/yellow]")
         else:
-            for log_entry in self.webhook_logs[-20:]:  # Show last 20 entries
-                console.print(log_entry)
+            # Show last 20 entries without copying the whole deque
+            start = max(0, len(self.webhook_logs) - 20)
+            for log_entry in itertools.islice(self.webhook_logs, start, None):
+                # Log lines can embed arbitrary ADB output; print them raw
+                # instead of running the markup parser over each one
+                console.print(log_entry, markup=False)
         
         console.input("\nPress Enter to continue...")
 
 # Consolidated functions from getsql.py
-def run_adb(cmd, timeout=15, capture_output=True):
-    """Run ADB command with error handling"""
+def _adb_dev(device):
+    """Common argv prefix for commands targeting a specific device"""
+    return ['adb', '-s', device]
+
+def run_adb(argv, timeout=15, capture_output=True):
+    """Run ADB command (argv list) with error handling"""
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=capture_output, text=True, timeout=timeout)
+        result = subprocess.run(argv, capture_output=capture_output, text=True, timeout=timeout)
         if result.returncode != 0:
             return None
         return result.stdout.strip() if capture_output else True
@@ -1463,81 +1819,321 @@ def run_adb(cmd, timeout=15, capture_output=True):
     except Exception as e:
         return None
 
+# Short-lived cache of the connected device serial; the device set rarely
+# changes between auto-update runs, so a cheap per-serial liveness probe
+# replaces a full `adb devices` enumeration while the cache is warm
+_DEVICE_CACHE_TTL = 30.0
+_device_cache = {'ts': 0.0, 'device': None}
+
+# Matches only lines in the 'device' state, so 'offline' and
+# 'unauthorized' entries can no longer be picked up by substring checks
+_DEVICE_RE = re.compile(r'^(\S+)\tdevice\s*$', re.MULTILINE)
+
+# Set once the adb server has been (re)started so enumeration failures
+# don't retrigger a start-server attempt on every call
+_server_started = False
+
+# adb pull compression args, detected once: sql.db is mostly text and
+# compresses well, so -z roughly halves USB transfer time where supported
+_pull_compression = None
+
+def _pull_compression_args():
+    """Return ['-z', 'brotli'] when the installed adb supports pull compression"""
+    global _pull_compression
+    if _pull_compression is None:
+        _pull_compression = []
+        out = run_adb(['adb', 'version'], timeout=10)
+        if out:
+            match = re.search(r'^Version (\d+)\.(\d+)\.(\d+)', out, re.MULTILINE)
+            if match and tuple(map(int, match.groups())) >= (34, 0, 4):
+                _pull_compression = ['-z', 'brotli']
+    return _pull_compression
+
+# Working root method per device serial (None means non-root), learned
+# during extraction and seeded from config['last_root_method'] by the
+# manager so later runs skip the full method fan-out
+_root_method_cache = {}
+
+def invalidate_device_cache():
+    """Forget the cached device serial after connect/add/remove operations"""
+    _device_cache['ts'] = 0.0
+    _device_cache['device'] = None
+
 def get_connected_device():
-    """Get the first connected ADB device"""
-    out = run_adb('adb devices')
+    """Get the first connected ADB device (cached for a short TTL)"""
+    cached = _device_cache['device']
+    if cached and time.time() - _device_cache['ts'] < _DEVICE_CACHE_TTL:
+        if run_adb(['adb', '-s', cached, 'get-state'], timeout=5) == 'device':
+            return cached
+        invalidate_device_cache()
+    out = run_adb(['adb', 'devices'])
     if not isinstance(out, str):
+        # Enumeration failed; start the adb server once and retry rather
+        # than probing liveness with a separate command on every run
+        global _server_started
+        if _server_started:
+            return None
+        _server_started = True
+        if run_adb(['adb', 'start-server'], timeout=15) is None:
+            return None
+        out = run_adb(['adb', 'devices'])
+        if not isinstance(out, str):
+            return None
+    match = _DEVICE_RE.search(out)
+    if not match:
         return None
-    lines = out.splitlines()
-    for line in lines[1:]:
-        if line.strip() and ('device' in line and not 'offline' in line):
-            return line.split()[0]
-    return None
-
-def run_adb_with_root(cmd, device, timeout=10):
-    """Run ADB command with root access fallback"""
-    # Try non-root first
-    try:
-        out = run_adb(cmd, timeout=timeout)
-        if out is not None and 'Permission denied' not in str(out):
-            return out, 'non-root', None
-    except Exception as e:
-        return None, 'non-root', f"Non-root error: {e}"
-    
-    # Try su 0 (works on some devices)
-    shell_part = cmd.split('shell',1)[1].strip() if 'shell' in cmd else cmd
-    su0_cmd = f'adb -s {device} shell su 0 {shell_part}'
-    try:
-        su0_out = run_adb(su0_cmd, timeout=timeout)
-        if su0_out is not None and 'Permission denied' not in str(su0_out):
-            return su0_out, 'su0', None
-    except Exception as e:
-        return None, 'su0', f"Su0 error: {e}"
-    
-    # Try su -c (works on other devices)
-    rootc_cmd = f'adb -s {device} shell su -c "{shell_part}"'
-    try:
-        rootc_out = run_adb(rootc_cmd, timeout=timeout)
-        if rootc_out is not None and 'Permission denied' not in str(rootc_out):
-            return rootc_out, 'suc', None
-    except Exception as e:
-        return None, 'suc', f"RootC error: {e}"
-    
+    _device_cache['device'] = match.group(1)
+    _device_cache['ts'] = time.time()
+    return _device_cache['device']
+
+class AdbShell:
+    """Long-lived `adb shell` session that runs commands over one pipe.
+
+    Each run() writes the command followed by an echoed sentinel carrying the
+    exit status, then reads stdout until the sentinel appears. That costs one
+    adb fork and transport handshake per session instead of one per command,
+    which dominates wall time in the multi-command extraction path.
+    """
+
+    _SENTINEL = '__BTT_END__'
+
+    def __init__(self, device):
+        self.device = device
+        self.proc = subprocess.Popen(
+            _adb_dev(device) + ['shell'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, text=True, bufsize=1)
+        self._lines = queue.Queue()
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def _read_loop(self):
+        for line in self.proc.stdout:
+            self._lines.put(line)
+
+    def alive(self):
+        return self.proc.poll() is None
+
+    def run(self, cmd, timeout=15):
+        """Run a shell command; returns (output, returncode), or (None, None) on failure"""
+        if not self.alive():
+            return None, None
+        try:
+            self.proc.stdin.write(f"{cmd}; echo {self._SENTINEL}$?\n")
+            self.proc.stdin.flush()
+        except (OSError, ValueError):
+            return None, None
+        parts = []
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # Command is wedged; the session is no longer trustworthy
+                self.close()
+                return None, None
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                self.close()
+                return None, None
+            idx = line.find(self._SENTINEL)
+            if idx < 0:
+                parts.append(line)
+                continue
+            if idx:
+                parts.append(line[:idx])
+            try:
+                rc = int(line[idx + len(self._SENTINEL):])
+            except ValueError:
+                rc = None
+            return ''.join(parts).strip(), rc
+
+    def close(self):
+        try:
+            self.proc.kill()
+        except Exception:
+            pass
+
+# Persistent shells cached per device serial
+_adb_shells = {}
+_adb_shells_lock = threading.Lock()
+
+def get_adb_shell(device):
+    """Return a cached persistent AdbShell for the device, or None if one cannot start"""
+    with _adb_shells_lock:
+        shell = _adb_shells.get(device)
+        if shell is None or not shell.alive():
+            try:
+                shell = AdbShell(device)
+            except Exception:
+                return None
+            _adb_shells[device] = shell
+        return shell
+
+def run_adb_with_root(device, shell_body, timeout=10):
+    """Run a device shell command (argv list) with root access fallback"""
+    joined = ' '.join(shlex.quote(arg) for arg in shell_body)
+    shell = get_adb_shell(device)
+    # Non-root first, then su 0 (some devices), then su -c (others); all
+    # three forms ride the same persistent shell session, with one-shot
+    # argv invocations as the fallback if the session dies
+    shell_prefix = _adb_dev(device) + ['shell']
+    variants = [
+        ('non-root', joined,
+         shell_prefix + list(shell_body)),
+        ('su0', f'su 0 {joined}',
+         shell_prefix + ['su', '0', *shell_body]),
+        ('suc', f'su -c {shlex.quote(joined)}',
+         shell_prefix + ['su', '-c', joined]),
+    ]
+    # Jump straight to the method known to work for this device, so rooted
+    # devices don't pay a failed non-root attempt on every call
+    if device in _root_method_cache:
+        cached = _root_method_cache[device] or 'non-root'
+        variants.sort(key=lambda variant: variant[0] != cached)
+    for method, inner, argv in variants:
+        try:
+            if shell is not None and shell.alive():
+                out, rc = shell.run(inner, timeout=timeout)
+                if out is None:
+                    shell = get_adb_shell(device)
+                elif rc == 0 and 'Permission denied' not in out:
+                    _root_method_cache[device] = None if method == 'non-root' else method
+                    return out, method, None
+            else:
+                out = run_adb(argv, timeout=timeout)
+                if out is not None and 'Permission denied' not in str(out):
+                    _root_method_cache[device] = None if method == 'non-root' else method
+                    return out, method, None
+        except Exception as e:
+            return None, method, f"{method} error: {e}"
+
     return None, 'all-failed', 'All root forms failed'
 
 def copy_to_sdcard(device, use_root=False):
     """Copy database from device to sdcard"""
     dst = '/sdcard/sql.db'
     if use_root == 'su0':
-        copy_cmd = f'adb -s {device} shell su 0 cp {DEVICE_DB_PATH} {dst}'
+        copy_cmd = _adb_dev(device) + ['shell', 'su', '0', 'cp', DEVICE_DB_PATH, dst]
     elif use_root == 'suc':
-        copy_cmd = f'adb -s {device} shell su -c "cp {DEVICE_DB_PATH} {dst}"'
+        copy_cmd = _adb_dev(device) + ['shell', 'su', '-c', f'cp {DEVICE_DB_PATH} {dst}']
     else:
-        copy_cmd = f'adb -s {device} shell cp "{DEVICE_DB_PATH}" "{dst}"'
+        copy_cmd = _adb_dev(device) + ['shell', 'cp', DEVICE_DB_PATH, dst]
     out = run_adb(copy_cmd, timeout=15)
     return out is not None
 
 def pull_from_sdcard(device):
     """Pull database from sdcard to local"""
-    if not os.path.exists(DB_DIR):
-        os.makedirs(DB_DIR)
-    pull_cmd = f'adb -s {device} pull /sdcard/sql.db "{LOCAL_DB_PATH}"'
-    out = run_adb(pull_cmd, timeout=30)
-    return os.path.exists(LOCAL_DB_PATH)
+    pulled, _, _ = _pull_file(device, '/sdcard/sql.db', LOCAL_DB_PATH)
+    return pulled
+
+_SQLITE_MAGIC = b'SQLite format 3\x00'
+
+def _pull_file(device, remote_path, local_db_path, timeout=30):
+    """adb pull into a temp file, replacing the target only on success.
+
+    A failed pull (permission denied on app-private paths is the common
+    case) leaves the previous local database untouched, so success must be
+    judged on the command outcome and the fresh temp file — never on the
+    final path, where a stale earlier pull would pass the check.
+    Returns (ok, pull_cmd, output) so callers can log the attempt.
+    """
+    tmp_path = local_db_path + '.part'
+    pull_cmd = _adb_dev(device) + ['pull', *_pull_compression_args(), remote_path, tmp_path]
+    out = run_adb(pull_cmd, timeout=timeout)
+    if out is not None and _pull_ok(tmp_path):
+        os.replace(tmp_path, local_db_path)
+        return True, pull_cmd, out
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+    return False, pull_cmd, out
+
+def stream_pull(device, db_path, local_db_path, used_root=None, timeout=30):
+    """Stream file bytes straight off the device via adb exec-out cat.
 
-def extract_sqlite_data_from_device():
+    Skips the /sdcard staging copy and cleanup entirely; the root variants
+    let cat read app-private data that a plain adb pull cannot. Writes to a
+    temp file and only replaces the target after verifying the SQLite header,
+    so a failed stream never clobbers a previous good pull. A watchdog kills
+    the adb process once the deadline passes — copyfileobj blocks until EOF,
+    so without it a wedged transport would hang the calling thread forever.
+    """
+    if used_root == 'su0':
+        cmd = _adb_dev(device) + ['exec-out', 'su', '0', 'cat', db_path]
+    elif used_root == 'suc':
+        cmd = _adb_dev(device) + ['exec-out', 'su', '-c', f'cat {db_path}']
+    else:
+        cmd = _adb_dev(device) + ['exec-out', 'cat', db_path]
+    tmp_path = local_db_path + '.part'
+    proc = None
+    watchdog = None
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+        # Killing the child closes the pipe, which unblocks the copy with
+        # a short read; the returncode check below then rejects the result
+        watchdog = threading.Timer(timeout, proc.kill)
+        watchdog.start()
+        with open(tmp_path, 'wb') as f:
+            shutil.copyfileobj(proc.stdout, f, length=1 << 20)
+        proc.wait(timeout=10)
+        with open(tmp_path, 'rb') as f:
+            if proc.returncode == 0 and f.read(len(_SQLITE_MAGIC)) == _SQLITE_MAGIC:
+                os.replace(tmp_path, local_db_path)
+                return True
+    except Exception:
+        pass
+    finally:
+        if watchdog is not None:
+            watchdog.cancel()
+        if proc is not None:
+            # No-op after a clean wait(); on any failure path it reaps the
+            # child so an aborted transfer never leaves adb cat running
+            proc.kill()
+            proc.wait()
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+    return False
+
+def extract_sqlite_data_from_device(device=None, local_db_path=None):
     """Main extraction function from getsql.py"""
     try:
-        debug_log = []
-        # Check ADB
-        if not run_adb('adb version'):
-            debug_log.append("ADB not available")
-            return {"result": "ADB not available", "success": False, "debug": debug_log}
-        # Get connected device
-        device = get_connected_device()
+        # Bounded ring buffer: extraction logs travel back over webhooks,
+        # so cap both entry count and entry length
+        debug_log = collections.deque(maxlen=200)
+
+        def dbg(entry):
+            debug_log.append(entry[:512])
+        if local_db_path is None:
+            local_db_path = LOCAL_DB_PATH
+        # Get connected device; get_connected_device starts the adb server
+        # on demand, so no separate liveness probe is needed here
+        if device is None:
+            device = get_connected_device()
         if not device:
-            debug_log.append("No ADB device connected")
-            return {"result": "No ADB device connected", "success": False, "debug": debug_log}
+            dbg("No ADB device connected")
+            return {"result": "No ADB device connected", "success": False, "debug": list(debug_log)}
+
+        # Argv prefixes built once per extraction instead of per command
+        dev_prefix = _adb_dev(device)
+        shell_prefix = dev_prefix + ['shell']
+
+        # Reuse one persistent shell session for all on-device commands,
+        # falling back to one-shot adb invocations if it dies
+        shell = get_adb_shell(device)
+
+        def device_shell(inner, timeout=10):
+            nonlocal shell
+            if shell is not None and shell.alive():
+                out, _ = shell.run(inner, timeout=timeout)
+                if out is not None:
+                    return out
+                shell = get_adb_shell(device)
+            return run_adb(shell_prefix + [inner], timeout=timeout)
+
         # Try all possible paths
         possible_paths = [
             '/data/data/com.bca.bcatrack/cache/cache/data/sql.db',
@@ -1546,77 +2142,144 @@ def extract_sqlite_data_from_device():
             '/data/data/com.bca.bcatrack/databases/sql.db',
             '/sdcard/sql.db'
         ]
+        # Fan the 5 paths x 3 root methods ls probes out concurrently; each
+        # probe is an independent device round trip, so discovery latency
+        # collapses from the serial sum to roughly one probe. Probes use
+        # one-shot adb invocations because the persistent shell is a single
+        # serial pipe.
+        probe_hit = threading.Event()
+        log_lock = threading.Lock()
+
+        def probe_ls(db_path, root_method):
+            if probe_hit.is_set():
+                return False
+            if root_method == 'su0':
+                cmd = shell_prefix + ['su', '0', 'ls', '-l', db_path]
+            elif root_method == 'suc':
+                cmd = shell_prefix + ['su', '-c', f'ls -l {db_path}']
+            else:
+                cmd = shell_prefix + ['ls', '-l', db_path]
+            out = run_adb(cmd, timeout=10)
+            with log_lock:
+                dbg(f"ls ({root_method or 'no-root'}): {' '.join(cmd)} => {out}")
+            out_str = str(out) if out is not None else ''
+            if out and 'No such file' not in out_str and 'Permission denied' not in out_str:
+                probe_hit.set()
+                return True
+            return False
+
+        def run_probes(probe_list):
+            probe_hit.clear()
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(lambda probe: probe_ls(*probe), probe_list))
+            found = {}
+            for (path, method), hit in zip(probe_list, results):
+                if hit and path not in found:
+                    found[path] = method
+            return found
+
+        # If a root method is already known for this device, probe only the
+        # paths with it (5 probes instead of 15); fall back to the full
+        # fan-out when the cached method stops working
+        accessible = {}
+        if device in _root_method_cache:
+            cached_method = _root_method_cache[device]
+            accessible = run_probes([(path, cached_method) for path in possible_paths])
+            if not accessible:
+                del _root_method_cache[device]
+        if not accessible:
+            accessible = run_probes([(path, method) for path in possible_paths
+                                     for method in (None, 'su0', 'suc')])
+
         for db_path in possible_paths:
-            debug_log.append(f"Trying path: {db_path}")
-            # Try all root methods for ls
-            found = False
-            for root_method in [None, 'su0', 'suc']:
-                if root_method == 'su0':
-                    cmd = f'adb -s {device} shell su 0 ls -l "{db_path}"'
-                elif root_method == 'suc':
-                    cmd = f'adb -s {device} shell su -c "ls -l {db_path}"'
-                else:
-                    cmd = f'adb -s {device} shell ls -l "{db_path}"'
-                out = run_adb(cmd, timeout=10)
-                debug_log.append(f"ls ({root_method or 'no-root'}): {cmd} => {out}")
-                out_str = str(out) if out is not None else ''
-                if out and 'No such file' not in out_str and 'Permission denied' not in out_str:
-                    found = True
-                    used_root = root_method
-                    break
-            if not found:
-                debug_log.append(f"File not found or not accessible at {db_path}")
+            if db_path not in accessible:
+                dbg(f"File not found or not accessible at {db_path}")
                 continue
-            # Try all root methods for cp to sdcard
+            used_root = accessible[db_path]
+            _root_method_cache[device] = used_root
+            dbg(f"Trying path: {db_path}")
+            # Direct pull first: when file perms allow it this skips the
+            # device-side cp, verify and cleanup entirely
+            pulled, pull_direct_cmd, pull_direct_out = _pull_file(device, db_path, local_db_path)
+            dbg(f"direct pull: {' '.join(pull_direct_cmd)} => {pull_direct_out}")
+            if pulled:
+                return {"result": "SUCCESS", "success": True, "debug": list(debug_log)}
+            # Next cheapest: stream the bytes with exec-out cat (root-capable,
+            # still no /sdcard staging) before the full copy dance
+            if stream_pull(device, db_path, local_db_path, used_root):
+                dbg(f"stream pull (exec-out cat, {used_root or 'no-root'}) succeeded for {db_path}")
+                return {"result": "SUCCESS", "success": True, "debug": list(debug_log)}
+            dbg("Direct and stream pulls failed; falling back to sdcard copy")
+            # Try all root methods for cp to sdcard; copy and verify run as
+            # one compound command so each attempt is a single roundtrip
+            # (and a single su invocation for the root variants)
             dst = '/sdcard/sql.db'
             copy_success = False
             for root_method in [used_root, None, 'su0', 'suc']:
+                script = f'cp "{db_path}" {dst} && ls -l {dst} && echo OK_COPY || echo FAIL'
                 if root_method == 'su0':
-                    copy_cmd = f'adb -s {device} shell su 0 cp "{db_path}" {dst}'
+                    copy_cmd = f"su 0 sh -c '{script}'"
                 elif root_method == 'suc':
-                    copy_cmd = f'adb -s {device} shell su -c "cp {db_path} {dst}"'
+                    copy_cmd = f"su -c '{script}'"
                 else:
-                    copy_cmd = f'adb -s {device} shell cp "{db_path}" {dst}'
-                out = run_adb(copy_cmd, timeout=15)
-                debug_log.append(f"cp ({root_method or 'no-root'}): {copy_cmd} => {out}")
-                # Check if file is on sdcard
-                check_cmd = f'adb -s {device} shell ls -l {dst}'
-                check_out = run_adb(check_cmd, timeout=10)
-                debug_log.append(f"ls sdcard: {check_cmd} => {check_out}")
-                check_out_str = str(check_out) if check_out is not None else ''
-                if check_out and 'No such file' not in check_out_str and 'Permission denied' not in check_out_str:
+                    copy_cmd = script
+                out = device_shell(copy_cmd, timeout=15)
+                dbg(f"cp+verify ({root_method or 'no-root'}): {copy_cmd} => {out}")
+                if out and 'OK_COPY' in str(out):
                     copy_success = True
                     break
             # Try to pull from sdcard
             if copy_success:
-                pull_cmd = f'adb -s {device} pull {dst} "{LOCAL_DB_PATH}"'
-                pull_out = run_adb(pull_cmd, timeout=30)
-                debug_log.append(f"pull: {pull_cmd} => {pull_out}")
-                if os.path.exists(LOCAL_DB_PATH):
+                pulled, pull_cmd, pull_out = _pull_file(device, dst, local_db_path)
+                dbg(f"pull: {' '.join(pull_cmd)} => {pull_out}")
+                if pulled:
                     # Clean up sdcard
-                    cleanup_cmd = f'adb -s {device} shell rm {dst}'
-                    run_adb(cleanup_cmd, timeout=10)
-                    debug_log.append(f"cleanup: {cleanup_cmd}")
-                    return {"result": "SUCCESS", "success": True, "debug": debug_log}
+                    cleanup_cmd = f'rm {dst}'
+                    device_shell(cleanup_cmd, timeout=10)
+                    dbg(f"cleanup: {cleanup_cmd}")
+                    return {"result": "SUCCESS", "success": True, "debug": list(debug_log)}
                 else:
-                    debug_log.append("Failed to pull file from sdcard")
-            # If copy to sdcard failed, try to pull directly
-            pull_direct_cmd = f'adb -s {device} pull "{db_path}" "{LOCAL_DB_PATH}"'
-            pull_direct_out = run_adb(pull_direct_cmd, timeout=30)
-            debug_log.append(f"direct pull: {pull_direct_cmd} => {pull_direct_out}")
-            if os.path.exists(LOCAL_DB_PATH):
-                return {"result": "SUCCESS", "success": True, "debug": debug_log}
-            else:
-                debug_log.append("Direct pull failed")
-        return {"result": "Database not found or not accessible on any known path", "success": False, "debug": debug_log}
+                    dbg("Failed to pull file from sdcard")
+        return {"result": "Database not found or not accessible on any known path", "success": False, "debug": list(debug_log)}
     except Exception as e:
         return {"result": f"Extraction error: {str(e)}", "success": False, "debug": [str(e)]}
 
+def _device_db_path(serial):
+    """Per-device local database path (serial-suffixed copy of LOCAL_DB_PATH)"""
+    safe = re.sub(r'[^A-Za-z0-9._-]', '_', serial)
+    return LOCAL_DB_PATH.replace('.db', f'_{safe}.db')
+
+def extract_from_all_devices(devices):
+    """Extract from every given device serial in parallel.
+
+    Each device pulls into its own suffixed copy of LOCAL_DB_PATH so
+    concurrent pulls cannot clobber each other. Returns {serial: result dict}.
+    """
+    if not devices:
+        return {}
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(devices)) as executor:
+        futures = {
+            executor.submit(extract_sqlite_data_from_device, device,
+                            _device_db_path(device)): device
+            for device in devices
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
 def main():
+    global _server_started
     logger.log('main() START')
     console.print("[bold blue]BTT Auto Manager[/bold blue]")
     console.print("Automated SQL Database Extraction Tool with Webhooks\n")
-    
+
+    # Warm the adb server once at startup so every later command skips the
+    # client's autostart probe; failures fall back to the lazy start in
+    # get_connected_device
+    if run_adb(['adb', 'start-server'], timeout=10) is not None:
+        _server_started = True
+
     try:
         # Initialize manager
         console.print("[blue]Initializing manager...[/blue]")
@@ -1640,7 +2303,6 @@ def main():
             logger.log('main() webhook server disabled')
         
         # Check if running in non-interactive mode (Docker container)
-        import sys
         if not sys.stdin.isatty():
             console.print("[yellow]Running in non-interactive mode (Docker container)[/yellow]")
             console.print("[green]Webhook server started[/green]")
@@ -1654,17 +2316,22 @@ def main():
             else:
                 console.print("[yellow]Auto-update disabled[/yellow]")
             
-            # Always keep the process alive in Docker
+            # Always keep the process alive in Docker; block on a
+            # signal-driven event instead of waking once per second, so
+            # SIGTERM from Docker stops the container immediately
             console.print("[blue]Entering main loop...[/blue]")
+            stop = threading.Event()
+            signal.signal(signal.SIGTERM, lambda *_: stop.set())
+            signal.signal(signal.SIGINT, lambda *_: stop.set())
             try:
-                while True:
-                    time.sleep(1)
+                stop.wait()
             except KeyboardInterrupt:
-                console.print("\n[yellow]Shutting down...[/yellow]")
-                if manager.running:
-                    manager.stop_auto_update()
-                if manager.webhook_server:
-                    manager.stop_webhook_server()
+                pass
+            console.print("\n[yellow]Shutting down...[/yellow]")
+            if manager.running:
+                manager.stop_auto_update()
+            if manager.webhook_server:
+                manager.stop_webhook_server()
         else:
             # Interactive mode - show menu
             console.print("[blue]Starting interactive menu...[/blue]")
@@ -1672,11 +2339,11 @@ def main():
             
     except Exception as e:
         logger.log(f'Exception in main(): {e}')
-        import traceback
         console.print(f"[red]Exception in main(): {e}[/red]")
         console.print(f"[red]Traceback: {traceback.format_exc()}[/red]")
         raise
     logger.log('main() END')
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    startup_checks()
+    main()
\ No newline at end of file